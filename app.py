@@ -1,23 +1,45 @@
-import gradio as gr
+import atexit
 import os
-from bpe import HindiBPE
+from bpe.encoder import BPEEncoder
 import json
 
 # Load the trained model
 MODEL_DIR = os.path.join('models', 'hindi_bpe')
-STATS_DIR = os.path.join('stats', 'hindi_bpe')
 
 def load_model():
-    """Load the trained BPE model."""
-    model = HindiBPE(vocab_size=5000)
+    """Load the trained BPE model (inference only, no training metrics)."""
     model_path = os.path.join(MODEL_DIR, 'model.json')
-    stats_path = os.path.join(STATS_DIR, 'metrics.json')
     
     try:
-        model.load(model_path, stats_path)
-        return model
+        model = BPEEncoder.from_file(model_path)
     except FileNotFoundError:
         raise Exception("Model not found. Please train the model first using train_hindi_bpe.py")
+    
+    # When running several workers, share the word cache between them
+    cache_name = os.environ.get('BPE_SHARED_CACHE')
+    if cache_name:
+        from bpe.shared_cache import SharedEncodeCache
+        # With KEEP set, a supervisor owns the block, so it must outlive its creator
+        keep = bool(os.environ.get('BPE_SHARED_CACHE_KEEP'))
+        cache = SharedEncodeCache.open_or_create(cache_name, model_key=model.model_key, track=not keep)
+        model.attach_shared_cache(cache)
+        atexit.register(release_shared_cache, cache)
+    return model
+
+def release_shared_cache(cache):
+    """Close this worker's view of the shared cache at exit.
+    
+    The worker that created the block also unlinks its name. Workers that
+    are still running keep their mapping, and a worker started after that
+    creates a fresh block. Set BPE_SHARED_CACHE_KEEP=1 when a supervisor
+    manages the block's lifetime and unlinks it itself.
+    """
+    cache.close()
+    if cache.created and not os.environ.get('BPE_SHARED_CACHE_KEEP'):
+        try:
+            cache.unlink()
+        except FileNotFoundError:
+            pass
 
 def tokenize_text(text, model):
     """Tokenize input text and return tokens with statistics."""
@@ -56,8 +78,9 @@ def tokenize_text(text, model):
 
 def create_interface():
     """Create the Gradio interface."""
-    # Load model
+    # Load model before importing gradio, which is slow to import
     model = load_model()
+    import gradio as gr
     
     # Define interface
     iface = gr.Interface(
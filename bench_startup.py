@@ -0,0 +1,60 @@
+"""Benchmark cold start of an inference-only tokenizer process.
+
+Each run starts a fresh interpreter that imports the slim encoder, loads the
+model and encodes one sentence. Exits non-zero if the median exceeds the
+target, e.g.
+
+    python bench_startup.py --runs 20 --target-ms 50
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+MODEL_PATH = os.path.join('models', 'hindi_bpe', 'model.json')
+
+CASES = {
+    'interpreter only': "pass",
+    'bpe.encoder (slim)': (
+        "from bpe.encoder import BPEEncoder\n"
+        "BPEEncoder.from_file({model!r}).encode('नमस्ते भारत')"
+    ),
+    'bpe.HindiBPE (full)': (
+        "from bpe import HindiBPE\n"
+        "b = HindiBPE()\n"
+        "b.load({model!r})\n"
+        "b.encode('नमस्ते भारत')"
+    ),
+}
+
+def time_startup(code: str, runs: int) -> list:
+    """Wall-clock milliseconds for each fresh interpreter running code."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', code], check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark tokenizer cold start.")
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--target-ms', type=float, default=50.0)
+    parser.add_argument('--model', default=MODEL_PATH)
+    args = parser.parse_args(argv)
+
+    medians = {}
+    for name, code in CASES.items():
+        timings = time_startup(code.format(model=args.model), args.runs)
+        medians[name] = statistics.median(timings)
+        print(f"{name:<22} median {medians[name]:6.1f} ms   min {min(timings):6.1f} ms")
+
+    slim = medians['bpe.encoder (slim)']
+    status = "OK" if slim <= args.target_ms else "OVER TARGET"
+    print(f"\nSlim encoder cold start: {slim:.1f} ms (target {args.target_ms:.0f} ms) {status}")
+    return 0 if slim <= args.target_ms else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,34 @@
-from .hindi_bpe import HindiBPE
-from .metrics import TrainingMetrics, MetricsLogger
-from .tokenizer import BaseTokenizer, CharacterTokenizer
+import importlib
 
-__all__ = ['HindiBPE', 'TrainingMetrics', 'MetricsLogger', 'BaseTokenizer', 'CharacterTokenizer'] 
\ No newline at end of file
+# Submodules are imported on first attribute access, so `import bpe` stays
+# cheap and inference code never pays for training, metrics or plotting.
+_EXPORTS = {
+    'HindiBPE': '.hindi_bpe',
+    'BPEEncoder': '.encoder',
+    'TrainingMetrics': '.metrics',
+    'MetricsLogger': '.metrics',
+    'BaseTokenizer': '.tokenizer',
+    'CharacterTokenizer': '.tokenizer',
+    'SharedEncodeCache': '.shared_cache',
+}
+
+__all__ = ['HindiBPE', 'BPEEncoder', 'TrainingMetrics', 'MetricsLogger', 'BaseTokenizer',
+           'CharacterTokenizer', 'SharedEncodeCache']
+
+TYPE_CHECKING = False  # avoid importing typing at startup
+if TYPE_CHECKING:
+    from .hindi_bpe import HindiBPE
+    from .encoder import BPEEncoder
+    from .metrics import TrainingMetrics, MetricsLogger
+    from .tokenizer import BaseTokenizer, CharacterTokenizer
+    from .shared_cache import SharedEncodeCache
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
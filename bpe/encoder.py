@@ -0,0 +1,225 @@
+from __future__ import annotations
+from array import array
+import json
+import re
+
+# typing costs ~10 ms to import, which matters for a cold-starting tokenizer
+# process; annotations are never evaluated, so only type checkers need it.
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Tuple, Dict, Set, Iterator
+
+# Matches the words produced by str.split()
+WORD_PATTERN = re.compile(r'\S+')
+
+class BPEEncoder:
+    """Inference-only BPE encoder that needs nothing but a saved model file.
+
+    Importing this module avoids the training, metrics and plotting code, so
+    tokenizer CLIs and serving workers start quickly. HindiBPE builds on it.
+    """
+
+    def __init__(self, cache_size: int = 100000):
+        self.merges: Dict[Tuple[str, str], str] = {}
+        self.vocab: Set[str] = set()
+        
+        # Encoding state, rebuilt whenever merges change
+        self.merge_ranks: Dict[Tuple[str, str], int] = {}
+        self._ranked_merges: List[Tuple[Tuple[str, str], str]] = []
+        self.token_to_id: Dict[str, int] = {}
+        self.id_to_token: List[str] = []
+        self.unk_id = 0
+        self.cache: Dict[str, Tuple[str, ...]] = {}
+        self.cache_size = cache_size
+        self.shared_cache = None
+
+    @classmethod
+    def from_file(cls, model_path: str, cache_size: int = 100000) -> 'BPEEncoder':
+        """Create an encoder from a model.json written by HindiBPE.save."""
+        encoder = cls(cache_size=cache_size)
+        encoder.load(model_path)
+        return encoder
+
+    def load(self, model_path: str):
+        """Load merges and vocab from a model file."""
+        with open(model_path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        self.merges = {tuple(k.split()): v for k, v in data['merges'].items()}
+        self.vocab = set(data['vocab'])
+        self._build_encoder()
+
+    def _build_encoder(self):
+        """Index merges by rank and assign token IDs (sorted vocab, unknown symbols last)."""
+        self.merge_ranks = {pair: rank for rank, pair in enumerate(self.merges)}
+        self._ranked_merges = list(self.merges.items())
+        self.id_to_token = sorted(self.vocab)
+        self.token_to_id = {token: i for i, token in enumerate(self.id_to_token)}
+        self.unk_id = len(self.id_to_token)
+        self.cache = {}
+        # IDs in a shared cache built for another model would decode to the wrong tokens
+        if self.shared_cache is not None and self.shared_cache.model_key != self.model_key:
+            self.shared_cache = None
+
+    @property
+    def model_key(self) -> int:
+        """Stable 64-bit fingerprint of the merges and token IDs, used to match shared caches to models."""
+        import hashlib
+        digest = hashlib.blake2b(digest_size=8)
+        for pair in self.merges:
+            digest.update(' '.join(pair).encode('utf-8') + b'\n')
+        # Token IDs follow the sorted vocab, so it must be part of the key too
+        digest.update(b'\0')
+        for token in sorted(self.vocab):
+            digest.update(token.encode('utf-8') + b'\n')
+        return int.from_bytes(digest.digest(), 'little')
+
+    def attach_shared_cache(self, cache, local_cache_size: int = 1024):
+        """Share word encodings with other worker processes through a SharedEncodeCache.
+
+        The per-process cache shrinks to a small L1 of local_cache_size words
+        in front of the shared table, so workers do not each keep a full copy.
+        The cache is detached if load() or fit() later changes the model.
+        """
+        if cache.model_key != self.model_key:
+            raise ValueError("Shared cache was created for a different model")
+        self.shared_cache = cache
+        self.cache_size = local_cache_size
+        while len(self.cache) > self.cache_size:
+            del self.cache[next(iter(self.cache))]
+
+    def _bpe_word(self, word: str) -> List[str]:
+        """Apply merges to a single word, equivalent to running HindiBPE.merge_vocab for each merge in order."""
+        tokens = list(word)
+        rank = -1
+        while len(tokens) > 1:
+            # Jump to the next merge (in training order) that applies to this word
+            best = None
+            for pair in zip(tokens, tokens[1:]):
+                r = self.merge_ranks.get(pair)
+                if r is not None and r > rank and (best is None or r < best):
+                    best = r
+            if best is None:
+                break
+            rank = best
+            (left, right), new_token = self._ranked_merges[rank]
+            merged = []
+            i = 0
+            while i < len(tokens):
+                if i < len(tokens) - 1 and tokens[i] == left and tokens[i + 1] == right:
+                    merged.append(new_token)
+                    i += 2
+                else:
+                    merged.append(tokens[i])
+                    i += 1
+            tokens = merged
+        return tokens
+
+    def encode_word(self, word: str) -> Tuple[str, ...]:
+        """Encode a single whitespace-free word, using the local and shared caches."""
+        tokens = self.cache.get(word)
+        if tokens is not None:
+            return tokens
+        
+        ids = self.shared_cache.get(word) if self.shared_cache is not None else None
+        if ids is not None:
+            tokens = tuple(self.id_to_token[i] for i in ids)
+        else:
+            tokens = tuple(self._bpe_word(word))
+            if self.shared_cache is not None:
+                ids = [self.token_to_id.get(t, self.unk_id) for t in tokens]
+                if self.unk_id not in ids:
+                    self.shared_cache.put(word, ids)
+        
+        if self.cache_size <= 0:
+            return tokens
+        if len(self.cache) >= self.cache_size:
+            # Evict the oldest entry
+            del self.cache[next(iter(self.cache))]
+        self.cache[word] = tokens
+        return tokens
+
+    def encode(self, text: str) -> List[str]:
+        """Encode text using learned BPE merges."""
+        self._check_encoder()
+        return [token for word in text.split() for token in self.encode_word(word)]
+
+    def _check_encoder(self):
+        """Rebuild encoding state if merges were changed directly."""
+        if len(self.merge_ranks) != len(self.merges):
+            self._build_encoder()
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens encode(text) would produce without building the token list."""
+        self._check_encoder()
+        return sum(len(self.encode_word(word)) for word in text.split())
+
+    def count_tokens_batch(self, texts: List[str]):
+        """Count tokens for each text, returned as a NumPy int64 array (requires numpy)."""
+        import numpy as np
+        return np.fromiter((self.count_tokens(text) for text in texts), dtype=np.int64, count=len(texts))
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """Return the longest prefix of text that encodes to at most max_tokens tokens.
+
+        Words are encoded lazily and encoding stops at the limit; a word that
+        straddles the limit is cut at a token boundary. Text that already fits
+        is returned unchanged.
+        """
+        if max_tokens < 0:
+            raise ValueError("max_tokens cannot be negative")
+        self._check_encoder()
+        remaining = max_tokens
+        end = 0
+        for match in WORD_PATTERN.finditer(text):
+            if remaining == 0:
+                return text[:end]
+            tokens = self.encode_word(match.group())
+            if len(tokens) > remaining:
+                return text[:match.start() + sum(len(t) for t in tokens[:remaining])]
+            remaining -= len(tokens)
+            end = match.end()
+        return text
+
+    def encode_ids(self, text: str) -> List[int]:
+        """Encode text to token IDs; symbols outside the vocab map to unk_id."""
+        tokens = self.encode(text)
+        return [self.token_to_id.get(token, self.unk_id) for token in tokens]
+
+    def encode_stream(self, source, chunk_size: int = 1 << 20) -> Iterator[array]:
+        """Encode a text file or iterable of strings chunk by chunk.
+
+        Yields array('I') token-ID arrays, one per chunk, so memory stays
+        bounded by chunk_size (plus the longest word). A word cut by a chunk
+        boundary is carried into the next chunk, so the concatenated output
+        equals encode_ids(full_text).
+        """
+        if hasattr(source, 'read'):
+            chunks = iter(lambda: source.read(chunk_size), '')
+        else:
+            chunks = source
+        # Pieces of a trailing partial word, joined only once whitespace ends it,
+        # so long runs without whitespace stay linear
+        carry: List[str] = []
+        for chunk in chunks:
+            if not chunk:
+                continue
+            # Find where the chunk's trailing partial word starts (rsplit scans from the end)
+            if chunk[-1].isspace():
+                split = len(chunk)
+            else:
+                split = len(chunk) - len(chunk.rsplit(None, 1)[-1])
+            if split == 0:
+                carry.append(chunk)
+                continue
+            data = ''.join(carry) + chunk[:split]
+            carry = [chunk[split:]] if split < len(chunk) else []
+            ids = self.encode_ids(data)
+            if ids:
+                yield array('I', ids)
+        ids = self.encode_ids(''.join(carry))
+        if ids:
+            yield array('I', ids)
+        
+    def decode(self, tokens: List[str]) -> str:
+        """Decode tokens back to text."""
+        return ' '.join(''.join(tokens))
@@ -3,15 +3,16 @@ from collections import Counter
 import json
 import re
 from .tokenizer import BaseTokenizer
+from .encoder import BPEEncoder
 from .metrics import TrainingMetrics, MetricsLogger
 import os
 
-class HindiBPE(BaseTokenizer):
+class HindiBPE(BaseTokenizer, BPEEncoder):
     """Byte-Pair Encoding implementation for Hindi text."""
     
-    def __init__(self, vocab_size: int = 5000):
-        super().__init__(vocab_size)
-        self.merges: Dict[Tuple[str, str], str] = {}
+    def __init__(self, vocab_size: int = 5000, cache_size: int = 100000):
+        BaseTokenizer.__init__(self, vocab_size)
+        BPEEncoder.__init__(self, cache_size)
         self.metrics = MetricsLogger()
         self.min_freq_threshold = 3  # Reduced from 5 to handle more diverse text
         
@@ -36,24 +37,55 @@ class HindiBPE(BaseTokenizer):
             
         return new_words
 
-    def fit(self, text: str, min_freq: int = 2):
-        """Train BPE on input text."""
+    def fit(self, text: str, min_freq: int = 2, backend: str = 'python',
+            sample_size: int = None, seed: int = None):
+        """Train BPE on input text.
+
+        backend='numpy' counts and merges pairs with vectorized array ops
+        (requires numpy) and learns exactly the same merges as 'python'.
+        If sample_size is given, training is approximate: pairs are ranked on
+        a count-weighted sample of that many word types and each chosen merge
+        is verified on the full word-count table. Sampling runs in pure Python
+        and cannot be combined with backend='numpy'. Training stops as soon as
+        the sample's best pair has a verified count below min_freq, even if
+        other pairs in the full table would still qualify; a sample whose
+        words are all fully merged is redrawn rather than ending training.
+        """
         if not text or not text.strip():
             raise ValueError("Input text cannot be empty")
+        if backend not in ('python', 'numpy'):
+            raise ValueError(f"Unknown backend: {backend}")
+        if sample_size is not None and backend != 'python':
+            raise ValueError("sample_size is only supported with backend='python'")
             
-        # Initialize with characters
-        words = [[c for c in word] for word in text.split()]
-        self.vocab = set(char for word in words for char in word)
-        
-        original_tokens = sum(len(word) for word in words)
+        corpus = None
+        if sample_size is not None:
+            # Count word types directly instead of splitting every occurrence into characters
+            from .sampling import SampledWordCounts
+            corpus = SampledWordCounts(Counter(text.split()).items(), sample_size, seed)
+            self.vocab = set(char for word in corpus.words for char in word)
+            original_tokens = corpus.num_tokens
+        else:
+            # Initialize with characters
+            words = [[c for c in word] for word in text.split()]
+            self.vocab = set(char for word in words for char in word)
+            
+            original_tokens = sum(len(word) for word in words)
+            
+            if backend == 'numpy':
+                from .numpy_backend import SymbolArray
+                corpus = SymbolArray(words)
         
         iteration = 0
         while len(self.vocab) < self.vocab_size:
-            pairs = self.get_stats(words)
-            if not pairs:
+            if corpus is None:
+                pairs = self.get_stats(words)
+                most_common = pairs.most_common(1)[0] if pairs else None
+            else:
+                most_common = corpus.most_common()
+            if most_common is None:
                 break
                 
-            most_common = pairs.most_common(1)[0]
             if most_common[1] < min_freq:
                 break
                 
@@ -62,10 +94,14 @@ class HindiBPE(BaseTokenizer):
             self.merges[pair] = new_token
             self.vocab.add(new_token)
             
-            words = self.merge_vocab(words, pair, new_token)
+            if corpus is None:
+                words = self.merge_vocab(words, pair, new_token)
+                current_tokens = sum(len(word) for word in words)
+            else:
+                corpus.merge(pair, new_token)
+                current_tokens = corpus.num_tokens
             
             # Calculate metrics
-            current_tokens = sum(len(word) for word in words)
             metrics = TrainingMetrics(
                 iteration=iteration,
                 vocab_size=len(self.vocab),
@@ -91,17 +127,7 @@ class HindiBPE(BaseTokenizer):
             compression_ratio=original_tokens / current_tokens
         )
         self.metrics.print_progress(final_metrics, force=True)
-
-    def encode(self, text: str) -> List[str]:
-        """Encode text using learned BPE merges."""
-        words = [[c for c in word] for word in text.split()]
-        for pair, new_token in self.merges.items():
-            words = self.merge_vocab(words, pair, new_token)
-        return [token for word in words for token in word]
-        
-    def decode(self, tokens: List[str]) -> str:
-        """Decode tokens back to text."""
-        return ' '.join(''.join(tokens))
+        self._build_encoder()
 
     def save(self, model_path: str, stats_path: str = None):
         """Save BPE model to file."""
@@ -118,10 +144,7 @@ class HindiBPE(BaseTokenizer):
 
     def load(self, model_path: str, stats_path: str = None):
         """Load BPE model from file."""
-        with open(model_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        self.merges = {tuple(k.split()): v for k, v in data['merges'].items()}
-        self.vocab = set(data['vocab'])
+        BPEEncoder.load(self, model_path)
         
         # Load metrics if available
         if stats_path and os.path.exists(stats_path):
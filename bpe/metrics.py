@@ -1,7 +1,10 @@
 from dataclasses import dataclass
-from typing import List, Dict
+from typing import List, Dict, Tuple
+import csv
 import json
 
+TOKEN_LOG_FIELDS = ('iteration', 'vocab_size', 'tokens', 'new_token', 'frequency')
+
 @dataclass
 class TrainingMetrics:
     """Container for training metrics."""
@@ -13,26 +16,47 @@ class TrainingMetrics:
     compression_ratio: float
 
 class MetricsLogger:
-    """Handles logging and saving of training metrics."""
+    """Handles logging and saving of training metrics.
+
+    Metrics are stored column-wise in `columns` (one list per field).
+    token_logs and compression_logs are read-only tuple snapshots of
+    per-iteration dicts, rebuilt on every access; use log_iteration to add
+    entries and `columns` for bulk reads.
+    """
     def __init__(self):
-        self.token_logs: List[Dict] = []
-        self.compression_logs: List[Dict] = []
-        
+        self.columns: Dict[str, List] = {
+            name: [] for name in TOKEN_LOG_FIELDS + ('compression_ratio',)
+        }
+
     def log_iteration(self, metrics: TrainingMetrics):
         """Log metrics for current iteration."""
-        self.token_logs.append({
-            'iteration': metrics.iteration,
-            'vocab_size': metrics.vocab_size,
-            'tokens': metrics.tokens,
-            'new_token': metrics.new_token,
-            'frequency': metrics.frequency
-        })
-        
-        self.compression_logs.append({
-            'iteration': metrics.iteration,
-            'compression_ratio': metrics.compression_ratio
-        })
-    
+        for name, values in self.columns.items():
+            values.append(getattr(metrics, name))
+
+    @property
+    def token_logs(self) -> Tuple[Dict, ...]:
+        """Read-only snapshot of the token logs (O(n) per access)."""
+        columns = [self.columns[name] for name in TOKEN_LOG_FIELDS]
+        return tuple(dict(zip(TOKEN_LOG_FIELDS, row)) for row in zip(*columns))
+
+    @token_logs.setter
+    def token_logs(self, logs: List[Dict]):
+        for name in TOKEN_LOG_FIELDS:
+            self.columns[name] = [log[name] for log in logs]
+
+    @property
+    def compression_logs(self) -> Tuple[Dict, ...]:
+        """Read-only snapshot of the compression logs (O(n) per access)."""
+        return tuple(
+            {'iteration': iteration, 'compression_ratio': ratio}
+            for iteration, ratio in zip(self.columns['iteration'], self.columns['compression_ratio'])
+        )
+
+    @compression_logs.setter
+    def compression_logs(self, logs: List[Dict]):
+        self.columns['iteration'] = [log['iteration'] for log in logs]
+        self.columns['compression_ratio'] = [log['compression_ratio'] for log in logs]
+
     def print_progress(self, metrics: TrainingMetrics, force: bool = False):
         """Print training progress."""
         if force or metrics.iteration % 500 == 0:
@@ -41,12 +65,41 @@ class MetricsLogger:
             print(f"Compression ratio: {metrics.compression_ratio:.2f}")
             print(f"New token: {metrics.new_token} (freq: {metrics.frequency:,})")
             print("-" * 50)
-    
+
+    def compare(self, reference: 'MetricsLogger', top_k: int = 100) -> Dict:
+        """Compare this run against a reference run, e.g. approximate vs exact training."""
+        ratios = self.columns['compression_ratio']
+        reference_ratios = reference.columns['compression_ratio']
+        ratio = ratios[-1] if ratios else 0.0
+        reference_ratio = reference_ratios[-1] if reference_ratios else 0.0
+        top_merges = set(self.columns['new_token'][:top_k])
+        reference_top = set(reference.columns['new_token'][:top_k])
+        return {
+            'compression_ratio': ratio,
+            'reference_compression_ratio': reference_ratio,
+            'compression_ratio_delta': ratio - reference_ratio,
+            'top_merge_agreement': len(top_merges & reference_top) / max(len(reference_top), 1)
+        }
+
     def save(self, path: str):
         """Save metrics to file."""
         data = {
-            'token_logs': self.token_logs,
-            'compression_logs': self.compression_logs
+            'token_logs': list(self.token_logs),
+            'compression_logs': list(self.compression_logs)
         }
         with open(path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=2) 
\ No newline at end of file
+            json.dump(data, f, ensure_ascii=False, indent=2)
+
+    def export(self, path: str):
+        """Export metrics as compact path.csv and, if numpy is installed, path.npz."""
+        names = list(self.columns)
+        with open(path + '.csv', 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(names)
+            writer.writerows(zip(*(self.columns[name] for name in names)))
+        
+        try:
+            import numpy as np
+        except ImportError:
+            return
+        np.savez_compressed(path + '.npz', **{name: np.asarray(values) for name, values in self.columns.items()})
@@ -0,0 +1,96 @@
+from typing import List, Tuple, Dict, Optional
+from collections import Counter
+import numpy as np
+
+class SymbolArray:
+    """Word-count table encoded as a flat int32 symbol array for vectorized BPE."""
+
+    def __init__(self, words: List[List[str]]):
+        # Collapse repeated words into types, keeping first-appearance order so
+        # that ties between equally frequent pairs break like the Python path.
+        type_counts: Dict[Tuple[str, ...], int] = {}
+        for word in words:
+            key = tuple(word)
+            type_counts[key] = type_counts.get(key, 0) + 1
+
+        self.token_to_id: Dict[str, int] = {}
+        self.id_to_token: List[str] = []
+        symbols = []
+        word_index = []
+        for index, word in enumerate(type_counts):
+            symbols.extend(self.get_id(token) for token in word)
+            word_index.extend([index] * len(word))
+
+        self.ids = np.array(symbols, dtype=np.int32)
+        self.word_ids = np.array(word_index, dtype=np.int32)
+        self.word_counts = np.array(list(type_counts.values()), dtype=np.int64)
+        self.num_tokens = int(self.word_counts[self.word_ids].sum())
+
+    def get_id(self, token: str) -> int:
+        """Return the symbol ID for a token, assigning a new one if needed."""
+        token_id = self.token_to_id.get(token)
+        if token_id is None:
+            token_id = len(self.id_to_token)
+            self.token_to_id[token] = token_id
+            self.id_to_token.append(token)
+        return token_id
+
+    def _pair_counts(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Count adjacent pairs as combined 64-bit keys, never crossing word boundaries."""
+        positions = np.flatnonzero(self.word_ids[:-1] == self.word_ids[1:])
+        keys = (self.ids[positions].astype(np.int64) << 32) | self.ids[positions + 1]
+        keys, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        weights = self.word_counts[self.word_ids[positions]]
+        counts = np.bincount(inverse.ravel(), weights=weights, minlength=keys.size).astype(np.int64)
+        return keys, counts, first
+
+    def _key_to_pair(self, key: int) -> Tuple[str, str]:
+        return (self.id_to_token[key >> 32], self.id_to_token[key & 0xFFFFFFFF])
+
+    def get_stats(self) -> Counter:
+        """Return pair frequencies as a Counter, ordered like HindiBPE.get_stats."""
+        keys, counts, first = self._pair_counts()
+        pairs = Counter()
+        for i in np.argsort(first, kind='stable'):
+            pairs[self._key_to_pair(int(keys[i]))] = int(counts[i])
+        return pairs
+
+    def most_common(self) -> Optional[Tuple[Tuple[str, str], int]]:
+        """Return the most frequent pair and its count, or None if no pairs remain."""
+        keys, counts, first = self._pair_counts()
+        if keys.size == 0:
+            return None
+        candidates = np.flatnonzero(counts == counts.max())
+        best = candidates[np.argmin(first[candidates])]
+        return self._key_to_pair(int(keys[best])), int(counts[best])
+
+    def merge(self, pair: Tuple[str, str], new_token: str) -> int:
+        """Merge all occurrences of a pair in place and return how many were merged."""
+        left = self.token_to_id.get(pair[0])
+        right = self.token_to_id.get(pair[1])
+        if left is None or right is None:
+            return 0
+
+        hits = np.flatnonzero(
+            (self.ids[:-1] == left) & (self.ids[1:] == right)
+            & (self.word_ids[:-1] == self.word_ids[1:])
+        )
+        if left == right and hits.size > 1:
+            # Runs such as "a a a" merge greedily from the left, so only every
+            # other position in a chain of consecutive hits is a real merge.
+            order = np.arange(hits.size)
+            chain_start = np.ones(hits.size, dtype=bool)
+            chain_start[1:] = np.diff(hits) != 1
+            offset = order - np.maximum.accumulate(np.where(chain_start, order, 0))
+            hits = hits[offset % 2 == 0]
+        if hits.size == 0:
+            return 0
+
+        merged = int(self.word_counts[self.word_ids[hits]].sum())
+        self.ids[hits] = self.get_id(new_token)
+        keep = np.ones(self.ids.size, dtype=bool)
+        keep[hits + 1] = False
+        self.ids = self.ids[keep]
+        self.word_ids = self.word_ids[keep]
+        self.num_tokens -= merged
+        return merged
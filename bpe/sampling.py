@@ -0,0 +1,100 @@
+from typing import Iterable, List, Tuple, Optional
+from collections import Counter
+import heapq
+import random
+
+class SampledWordCounts:
+    """Word-count table that estimates pair frequencies from a weighted sample of word types.
+
+    Candidate merges are ranked on a reservoir sample of word types (drawn with
+    probability proportional to word count), then verified against the full
+    table, so logged frequencies and compression ratios stay exact. Once every
+    sampled type is a single token, a fresh sample is drawn from the types
+    that still have pairs.
+    """
+
+    def __init__(self, word_counts: Iterable[Tuple[str, int]], sample_size: int, seed: Optional[int] = None):
+        if sample_size <= 0:
+            raise ValueError("Sample size must be positive")
+        self.words: List[List[str]] = []
+        self.counts: List[int] = []
+        for word, count in word_counts:
+            self.words.append(list(word))
+            self.counts.append(count)
+        self.num_tokens = sum(len(w) * c for w, c in zip(self.words, self.counts))
+        self.sample_size = sample_size
+        self.rng = random.Random(seed)
+        self.sample = self._reservoir_sample(sample_size, self.rng)
+
+    def _reservoir_sample(self, k: int, rng: random.Random) -> List[int]:
+        """Weighted reservoir sampling (A-Res): keep the k largest u ** (1 / count) keys.
+
+        Types that are already a single token have no pairs and are skipped.
+        """
+        reservoir: List[Tuple[float, int]] = []
+        for index, count in enumerate(self.counts):
+            if len(self.words[index]) < 2:
+                continue
+            key = rng.random() ** (1.0 / count)
+            if len(reservoir) < k:
+                heapq.heappush(reservoir, (key, index))
+            elif key > reservoir[0][0]:
+                heapq.heapreplace(reservoir, (key, index))
+        return sorted(index for _, index in reservoir)
+
+    def estimate_stats(self) -> Counter:
+        """Estimate pair frequencies from the sampled word types."""
+        pairs = Counter()
+        for index in self.sample:
+            word, count = self.words[index], self.counts[index]
+            for i in range(len(word) - 1):
+                pairs[word[i], word[i + 1]] += count
+        return pairs
+
+    def count_pair(self, pair: Tuple[str, str]) -> int:
+        """Count a pair exactly over the full word-count table."""
+        total = 0
+        for word, count in zip(self.words, self.counts):
+            if pair[0] not in word:
+                continue
+            for i in range(len(word) - 1):
+                if word[i] == pair[0] and word[i + 1] == pair[1]:
+                    total += count
+        return total
+
+    def most_common(self) -> Optional[Tuple[Tuple[str, str], int]]:
+        """Pick the best pair from the sample and return it with its verified count.
+
+        Only the sample's top pair is verified, so if its exact count falls
+        below min_freq, fit stops even when other pairs would still qualify.
+        Returns None only when no word in the full table has a pair left.
+        """
+        pairs = self.estimate_stats()
+        if not pairs:
+            self.sample = self._reservoir_sample(self.sample_size, self.rng)
+            pairs = self.estimate_stats()
+            if not pairs:
+                return None
+        pair, _ = pairs.most_common(1)[0]
+        return pair, self.count_pair(pair)
+
+    def merge(self, pair: Tuple[str, str], new_token: str) -> int:
+        """Merge all occurrences of a pair in the full table and return how many were merged."""
+        merged = 0
+        for index, word in enumerate(self.words):
+            if len(word) < 2 or pair[0] not in word:
+                continue
+            new_word = []
+            i = 0
+            while i < len(word):
+                if i < len(word) - 1 and word[i] == pair[0] and word[i + 1] == pair[1]:
+                    new_word.append(new_token)
+                    i += 2
+                else:
+                    new_word.append(word[i])
+                    i += 1
+            if len(new_word) != len(word):
+                merged += (len(word) - len(new_word)) * self.counts[index]
+                self.words[index] = new_word
+        self.num_tokens -= merged
+        return merged
@@ -0,0 +1,201 @@
+from typing import List, Optional
+from array import array
+from multiprocessing import shared_memory
+import hashlib
+import struct
+import threading
+import time
+
+MAGIC = 0x48425045  # "HBPE"
+HEADER = struct.Struct('<IIIIQ')  # magic, capacity, max_span, probe_limit, model_key
+MAGIC_FIELD = struct.Struct('<I')
+HEADER_SIZE = 32
+
+# Serializes the resource tracker workaround in attach() within this process
+_register_lock = threading.Lock()
+
+def word_hash(word: str) -> int:
+    """Stable 64-bit hash of a word (Python's hash() is salted per process)."""
+    h = int.from_bytes(hashlib.blake2b(word.encode('utf-8'), digest_size=8).digest(), 'little')
+    return h or 1  # 0 marks an empty slot
+
+def slot_checksum(h: int, ids: bytes) -> int:
+    """Checksum binding a word hash to its token-ID bytes."""
+    return int.from_bytes(hashlib.blake2b(h.to_bytes(8, 'little') + ids, digest_size=8).digest(), 'little')
+
+class SharedEncodeCache:
+    """Word hash -> token-ID span cache in shared memory, readable and writable by all workers.
+
+    The table is open-addressed with a bounded probe window. Each slot holds a
+    64-bit word hash, a span length, up to max_span token IDs inline and a
+    checksum of the hash and IDs, so the total size is fixed at creation. When
+    a probe window is full, inserts evict one of its slots. There are no
+    cross-process locks: readers recompute the checksum, so a slot that is
+    being rewritten, or was interleaved by several concurrent writers, is
+    seen as a miss rather than returning another word's tokens.
+
+    The block outlives the processes using it until someone calls unlink().
+    On POSIX, unlinking only removes the name: workers already attached keep
+    a valid mapping, and a worker that opens the name later creates a new block.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, created: bool = False):
+        self.shm = shm
+        self.created = created
+        magic, self.capacity, self.max_span, self.probe_limit, self.model_key = \
+            HEADER.unpack_from(shm.buf, 0)
+        if magic != MAGIC:
+            raise ValueError(f"Shared memory block {shm.name!r} is not an encode cache")
+
+        hashes_end = HEADER_SIZE + 8 * self.capacity
+        checks_end = hashes_end + 8 * self.capacity
+        ids_end = checks_end + 4 * self.capacity * self.max_span
+        lengths_end = ids_end + 2 * self.capacity
+        self.hashes = shm.buf[HEADER_SIZE:hashes_end].cast('Q')
+        self.checks = shm.buf[hashes_end:checks_end].cast('Q')
+        self.ids = shm.buf[checks_end:ids_end].cast('I')
+        self.lengths = shm.buf[ids_end:lengths_end].cast('H')
+        self.hits = 0
+        self.misses = 0
+        self._evict_cursor = 0
+
+    @staticmethod
+    def nbytes(capacity: int, max_span: int) -> int:
+        """Size of the shared memory block for a given capacity."""
+        return HEADER_SIZE + capacity * (8 + 8 + 4 * max_span + 2)
+
+    @classmethod
+    def create(cls, name: Optional[str] = None, capacity: int = 1 << 16,
+               max_span: int = 16, probe_limit: int = 8, model_key: int = 0,
+               track: bool = True) -> 'SharedEncodeCache':
+        """Create a new shared cache. Whoever manages the workers should unlink() it on shutdown.
+
+        With track=False the block is not handed to the resource tracker, so
+        it survives the creating process exiting until someone unlinks it.
+        """
+        if capacity <= 0 or probe_limit <= 0:
+            raise ValueError("Capacity and probe limit must be positive")
+        if not 0 < max_span < 1 << 16:
+            raise ValueError("Max span must be between 1 and 65535")
+        size = cls.nbytes(capacity, max_span)
+        if track:
+            shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        else:
+            try:
+                shm = shared_memory.SharedMemory(name=name, create=True, size=size, track=False)
+            except TypeError:
+                # Python < 3.13 always registers the block; take it back off the tracker
+                from multiprocessing import resource_tracker
+                shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+                resource_tracker.unregister(shm._name, 'shared_memory')
+        # Publish the magic last so attaching workers never see a half-written header
+        HEADER.pack_into(shm.buf, 0, 0, capacity, max_span, min(probe_limit, capacity), model_key)
+        MAGIC_FIELD.pack_into(shm.buf, 0, MAGIC)
+        return cls(shm, created=True)
+
+    @classmethod
+    def attach(cls, name: str, timeout: float = 5.0) -> 'SharedEncodeCache':
+        """Attach to a cache created by another process, waiting for it to be initialized."""
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                shm = cls._open(name)
+            except ValueError:
+                # The creator has not sized the block yet ("cannot mmap an empty file")
+                shm = None
+            if shm is not None:
+                if shm.size >= HEADER_SIZE and MAGIC_FIELD.unpack_from(shm.buf, 0)[0] == MAGIC:
+                    return cls(shm)
+                shm.close()
+            if time.monotonic() > deadline:
+                raise ValueError(f"Shared memory block {name!r} is not an encode cache")
+            time.sleep(0.001)
+
+    @staticmethod
+    def _open(name: str) -> shared_memory.SharedMemory:
+        """Open an existing block without handing it to the resource tracker."""
+        try:
+            return shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            pass
+        # Python < 3.13 always tracks the block, and the tracker would unlink
+        # it when this worker exits, so registration is skipped while opening.
+        # The lock covers concurrent attach() calls; other threads creating
+        # SharedMemory blocks at the same moment could miss registration.
+        from multiprocessing import resource_tracker
+        with _register_lock:
+            register = resource_tracker.register
+            resource_tracker.register = lambda name, rtype: None
+            try:
+                return shared_memory.SharedMemory(name=name)
+            finally:
+                resource_tracker.register = register
+
+    @classmethod
+    def open_or_create(cls, name: str, **kwargs) -> 'SharedEncodeCache':
+        """Attach to the named cache, creating it (with create()'s kwargs) if no worker has yet."""
+        try:
+            return cls.create(name, **kwargs)
+        except FileExistsError:
+            return cls.attach(name)
+
+    def get(self, word: str) -> Optional[List[int]]:
+        """Return the cached token IDs for a word, or None on a miss."""
+        h = word_hash(word)
+        home = h % self.capacity
+        for i in range(self.probe_limit):
+            slot = (home + i) % self.capacity
+            slot_hash = self.hashes[slot]
+            if slot_hash == 0:
+                break
+            if slot_hash == h:
+                length = self.lengths[slot]
+                start = slot * self.max_span
+                data = self.ids[start:start + min(length, self.max_span)].tobytes()
+                if length and self.checks[slot] == slot_checksum(h, data):
+                    self.hits += 1
+                    return memoryview(data).cast('I').tolist()
+                break
+        self.misses += 1
+        return None
+
+    def put(self, word: str, ids: List[int]) -> bool:
+        """Store a word's token IDs, evicting within the probe window if it is full."""
+        if not ids or len(ids) > self.max_span:
+            return False
+        h = word_hash(word)
+        home = h % self.capacity
+        target = None
+        for i in range(self.probe_limit):
+            slot = (home + i) % self.capacity
+            slot_hash = self.hashes[slot]
+            if slot_hash == h:
+                return True
+            if slot_hash == 0:
+                target = slot
+                break
+        if target is None:
+            self._evict_cursor = (self._evict_cursor + 1) % self.probe_limit
+            target = (home + self._evict_cursor) % self.capacity
+
+        data = array('I', ids)
+        start = target * self.max_span
+        self.hashes[target] = 0
+        self.ids[start:start + len(ids)] = memoryview(data)
+        self.lengths[target] = len(ids)
+        self.checks[target] = slot_checksum(h, data.tobytes())
+        self.hashes[target] = h
+        return True
+
+    def __len__(self) -> int:
+        return sum(1 for h in self.hashes if h)
+
+    def close(self):
+        """Release this process's view of the shared memory. Safe to call more than once."""
+        for view in (self.hashes, self.checks, self.ids, self.lengths):
+            view.release()
+        self.shm.close()
+
+    def unlink(self):
+        """Remove the block's name; existing mappings stay valid until closed."""
+        self.shm.unlink()
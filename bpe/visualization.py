@@ -1,97 +1,110 @@
-import matplotlib.pyplot as plt
 import os
 
+def minmax_downsample(x, y, max_points: int = 2000):
+    """Decimate a series to about max_points, keeping each bucket's min and max.
+
+    Peaks and dips survive decimation, so long curves look the same as the
+    full-resolution plot.
+    """
+    import numpy as np
+    x = np.asarray(x)
+    y = np.asarray(y)
+    if len(y) <= max_points:
+        return x, y
+    buckets = max(max_points // 2, 1)
+    size = -(-len(y) // buckets)  # ceil division
+    padded = np.pad(y, (0, buckets * size - len(y)), mode='edge').reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    keep = np.concatenate([
+        [0, len(y) - 1],
+        offsets + padded.argmin(axis=1),
+        offsets + padded.argmax(axis=1),
+    ])
+    keep = np.unique(np.minimum(keep, len(y) - 1))
+    return x[keep], y[keep]
+
 class BPEVisualizer:
     """Visualizes BPE training statistics."""
-    
-    def __init__(self, stats_dir: str):
+
+    PLOTS = {
+        'vocab_size.png': 0,
+        'compression_ratio.png': 1,
+        'token_frequencies.png': 2,
+    }
+
+    def __init__(self, stats_dir: str, max_points: int = 2000, dpi: int = 100):
         self.stats_dir = stats_dir
         self.plots_dir = os.path.join(stats_dir, 'plots')
+        self.max_points = max_points
+        self.dpi = dpi
         os.makedirs(self.plots_dir, exist_ok=True)
-        
+
     def plot_training_stats(self, metrics_logger):
-        """Generate all training statistics plots."""
-        # Get data from metrics
-        iterations = [log['iteration'] for log in metrics_logger.token_logs]
-        vocab_sizes = [log['vocab_size'] for log in metrics_logger.token_logs]
-        token_freqs = [log['frequency'] for log in metrics_logger.token_logs]
-        compression_ratios = [log['compression_ratio'] for log in metrics_logger.compression_logs]
-        
+        """Generate all training statistics plots from a single render.
+
+        The figure is drawn once with Agg; the individual plots are crops of
+        that pixel buffer rather than separate savefig calls.
+        """
+        # Plotting libraries are heavy, so only import them when plotting
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        from matplotlib.figure import Figure
+        import matplotlib.image as mpimg
+        import numpy as np
+
+        # Read metric columns directly
+        columns = metrics_logger.columns
+        iterations = np.asarray(columns['iteration'])
+        vocab_sizes = np.asarray(columns['vocab_size'])
+        token_freqs = np.asarray(columns['frequency'])
+        compression_ratios = np.asarray(columns['compression_ratio'])
+
         # Create figure with subplots
-        fig = plt.figure(figsize=(20, 15))
-        
+        fig = Figure(figsize=(20, 15), dpi=self.dpi)
+        canvas = FigureCanvasAgg(fig)
+        axes = fig.subplots(2, 2)
+        ax1, ax2, ax3, ax4 = axes.flat
+
         # 1. Vocabulary Size Growth
-        ax1 = fig.add_subplot(221)
-        ax1.plot(iterations, vocab_sizes)
+        ax1.plot(*minmax_downsample(iterations, vocab_sizes, self.max_points))
         ax1.set_title('Vocabulary Size Growth')
         ax1.set_xlabel('Iteration')
         ax1.set_ylabel('Vocabulary Size')
         ax1.grid(True)
-        
+
         # 2. Compression Ratio Progress
-        ax2 = fig.add_subplot(222)
-        ax2.plot(iterations, compression_ratios)
+        ax2.plot(*minmax_downsample(iterations, compression_ratios, self.max_points))
         ax2.set_title('Compression Ratio Progress')
         ax2.set_xlabel('Iteration')
         ax2.set_ylabel('Compression Ratio')
         ax2.grid(True)
-        
+
         # 3. Token Frequencies (Log Scale)
-        ax3 = fig.add_subplot(223)
-        ax3.plot(iterations, token_freqs)
+        ax3.plot(*minmax_downsample(iterations, token_freqs, self.max_points))
         ax3.set_title('Token Frequencies')
         ax3.set_xlabel('Iteration')
         ax3.set_ylabel('Frequency')
         ax3.set_yscale('log')
         ax3.grid(True)
-        
-        # 4. Compression Ratio Distribution
-        ax4 = fig.add_subplot(224)
+
+        # 4. Compression Ratio Distribution (histogram uses the full series)
         ax4.hist(compression_ratios, bins=50)
         ax4.set_title('Compression Ratio Distribution')
         ax4.set_xlabel('Compression Ratio')
         ax4.set_ylabel('Count')
         ax4.grid(True)
-        
-        # Save combined plot
-        plt.tight_layout()
-        plt.savefig(os.path.join(self.plots_dir, 'training_stats.png'))
-        plt.close()
-        
-        # Save individual plots
-        self._save_individual_plots(
-            iterations, vocab_sizes, compression_ratios, token_freqs
-        )
-    
-    def _save_individual_plots(self, iterations, vocab_sizes, compression_ratios, token_freqs):
-        """Save individual plots for each metric."""
-        # Vocabulary Size
-        plt.figure(figsize=(10, 6))
-        plt.plot(iterations, vocab_sizes)
-        plt.title('Vocabulary Size Growth')
-        plt.xlabel('Iteration')
-        plt.ylabel('Vocabulary Size')
-        plt.grid(True)
-        plt.savefig(os.path.join(self.plots_dir, 'vocab_size.png'))
-        plt.close()
-        
-        # Compression Ratio
-        plt.figure(figsize=(10, 6))
-        plt.plot(iterations, compression_ratios)
-        plt.title('Compression Ratio Progress')
-        plt.xlabel('Iteration')
-        plt.ylabel('Compression Ratio')
-        plt.grid(True)
-        plt.savefig(os.path.join(self.plots_dir, 'compression_ratio.png'))
-        plt.close()
-        
-        # Token Frequencies
-        plt.figure(figsize=(10, 6))
-        plt.plot(iterations, token_freqs)
-        plt.title('Token Frequencies')
-        plt.xlabel('Iteration')
-        plt.ylabel('Frequency')
-        plt.yscale('log')
-        plt.grid(True)
-        plt.savefig(os.path.join(self.plots_dir, 'token_frequencies.png'))
-        plt.close() 
\ No newline at end of file
+
+        # Render once and save the combined plot
+        fig.tight_layout()
+        canvas.draw()
+        image = np.asarray(canvas.buffer_rgba())
+        mpimg.imsave(os.path.join(self.plots_dir, 'training_stats.png'), image, dpi=self.dpi)
+
+        # Save individual plots by cropping the rendered pixels (display
+        # coordinates start at the bottom left, image rows at the top)
+        renderer = canvas.get_renderer()
+        height, width = image.shape[:2]
+        for filename, index in self.PLOTS.items():
+            bbox = axes.flat[index].get_tightbbox(renderer).padded(10)
+            x0, x1 = max(int(bbox.x0), 0), min(int(np.ceil(bbox.x1)), width)
+            y0, y1 = max(height - int(np.ceil(bbox.y1)), 0), min(height - int(bbox.y0), height)
+            mpimg.imsave(os.path.join(self.plots_dir, filename), image[y0:y1, x0:x1], dpi=self.dpi)
@@ -0,0 +1,102 @@
+"""Encode text files (or stdin) into packed binary token shards.
+
+Each shard is a flat file of token IDs (uint16 when the vocabulary fits,
+otherwise uint32) and an index JSON records the shards, dtype and the token
+range of every input, e.g.
+
+    cat corpus.txt | python encode_hindi_bpe.py -o shards/hindi
+    python encode_hindi_bpe.py a.txt b.txt -o shards/hindi --shard-size 50000000
+"""
+from array import array
+import argparse
+import io
+import json
+import os
+import sys
+
+from bpe.encoder import BPEEncoder
+
+MODEL_PATH = os.path.join('models', 'hindi_bpe', 'model.json')
+
+class ShardWriter:
+    """Buffers token IDs and writes them out as fixed-size .bin shards."""
+
+    def __init__(self, prefix: str, shard_size: int, typecode: str):
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.typecode = typecode
+        self.buffer = array(typecode)
+        self.shards = []
+        self.total_tokens = 0
+
+    def write(self, ids):
+        """Append token IDs, flushing every full shard."""
+        self.buffer.extend(array(self.typecode, ids))
+        self.total_tokens += len(ids)
+        while len(self.buffer) >= self.shard_size:
+            self._flush(self.buffer[:self.shard_size])
+            del self.buffer[:self.shard_size]
+
+    def close(self):
+        """Write the final partial shard."""
+        if self.buffer:
+            self._flush(self.buffer)
+            self.buffer = array(self.typecode)
+
+    def _flush(self, ids):
+        filename = f"{os.path.basename(self.prefix)}_{len(self.shards):05d}.bin"
+        with open(os.path.join(os.path.dirname(self.prefix), filename), 'wb') as f:
+            ids.tofile(f)
+        self.shards.append({'file': filename, 'tokens': len(ids)})
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Encode text into binary token shards.")
+    parser.add_argument('inputs', nargs='*', default=['-'], help="Text files to encode ('-' for stdin)")
+    parser.add_argument('-o', '--output', required=True, help="Output prefix, e.g. shards/hindi")
+    parser.add_argument('--model', default=MODEL_PATH, help="Path to the trained model.json")
+    parser.add_argument('--shard-size', type=int, default=100_000_000, help="Tokens per shard")
+    parser.add_argument('--chunk-size', type=int, default=1 << 20, help="Characters read at a time")
+    args = parser.parse_args(argv)
+    if args.shard_size <= 0 or args.chunk_size <= 0:
+        parser.error("--shard-size and --chunk-size must be positive")
+
+    bpe = BPEEncoder.from_file(args.model)
+
+    # unk_id is the largest ID the model can emit
+    typecode, dtype = ('H', 'uint16') if bpe.unk_id < 1 << 16 else ('I', 'uint32')
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    writer = ShardWriter(args.output, args.shard_size, typecode)
+
+    documents = []
+    for path in args.inputs:
+        start = writer.total_tokens
+        if path == '-':
+            # Read stdin as UTF-8 like the input files, whatever the locale
+            stdin = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8')
+            for ids in bpe.encode_stream(stdin, args.chunk_size):
+                writer.write(ids)
+            stdin.detach()
+        else:
+            with open(path, 'r', encoding='utf-8') as f:
+                for ids in bpe.encode_stream(f, args.chunk_size):
+                    writer.write(ids)
+        documents.append({'source': path, 'start': start, 'end': writer.total_tokens})
+    writer.close()
+
+    index = {
+        'dtype': dtype,
+        'byteorder': sys.byteorder,
+        'vocab_size': bpe.unk_id + 1,
+        'unk_id': bpe.unk_id,
+        'model_key': bpe.model_key,
+        'total_tokens': writer.total_tokens,
+        'shards': writer.shards,
+        'documents': documents
+    }
+    with open(args.output + '.index.json', 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    print(f"Wrote {writer.total_tokens:,} tokens in {len(writer.shards)} shard(s) to {args.output}_*.bin",
+          file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,46 @@
 import unittest
-from bpe import HindiBPE, TrainingMetrics
+import io
+from array import array
+from bpe import HindiBPE, TrainingMetrics, SharedEncodeCache
+from bpe.shared_cache import word_hash
 import json
 import os
 import tempfile
 import shutil
+import multiprocessing
+import subprocess
+import sys
+
+try:
+    import numpy
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
 
 # Use the same directory structure as train_hindi_bpe.py
 MODEL_DIR = os.path.join('models', 'hindi_bpe')
 STATS_DIR = os.path.join('stats', 'hindi_bpe')
 DATA_DIR = os.path.join('data', 'hindi')
 
+def _encode_with_shared_cache(model_path, cache_name, text):
+    """Worker process: load the model and encode text through a shared cache."""
+    bpe = HindiBPE(vocab_size=100)
+    bpe.load(model_path)
+    cache = SharedEncodeCache.attach(cache_name)
+    bpe.attach_shared_cache(cache)
+    bpe.encode(text)
+    cache.close()
+
+def _open_shared_cache(cache_name, barrier, results):
+    """Worker process: open the shared cache at the same moment as its siblings."""
+    barrier.wait()
+    try:
+        cache = SharedEncodeCache.open_or_create(cache_name, model_key=7)
+        results.put((cache.model_key, cache.created))
+        cache.close()
+    except Exception as e:
+        results.put((repr(e), None))
+
 class TestHindiBPE(unittest.TestCase):
     @classmethod
     def setUpClass(cls):
@@ -221,5 +252,382 @@ class TestHindiBPE(unittest.TestCase):
         decoded_clean = ''.join(decoded.split())
         self.assertEqual(test_word, decoded_clean)
 
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_numpy_get_stats(self):
+        """Test vectorized pair counting matches the Python path."""
+        from bpe.numpy_backend import SymbolArray
+        words = [[c for c in word] for word in (self.test_text + " आआआ आआ").split()]
+        stats = SymbolArray(words).get_stats()
+        self.assertEqual(list(stats.items()), list(self.bpe.get_stats(words).items()))
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_numpy_fit_matches_python(self):
+        """Test the numpy backend learns identical merges and metrics."""
+        text = self.test_text + " आआआआ आआआ आ आ"
+        self.bpe.fit(text)
+        numpy_bpe = HindiBPE(vocab_size=100)
+        numpy_bpe.fit(text, backend='numpy')
+        self.assertEqual(list(self.bpe.merges.items()), list(numpy_bpe.merges.items()))
+        self.assertEqual(self.bpe.vocab, numpy_bpe.vocab)
+        self.assertEqual(self.bpe.metrics.token_logs, numpy_bpe.metrics.token_logs)
+        self.assertEqual(self.bpe.metrics.compression_logs, numpy_bpe.metrics.compression_logs)
+
+    def test_sampled_fit(self):
+        """Test approximate training verifies merge counts on the full table."""
+        words = [[c for c in word] for word in self.test_text.split()]
+        self.bpe.fit(self.test_text, sample_size=5, seed=0)
+        self.assertGreater(len(self.bpe.merges), 0)
+
+        # The first merge is verified against exact counts from the full corpus
+        first_log = self.bpe.metrics.token_logs[0]
+        first_pair = next(iter(self.bpe.merges))
+        self.assertEqual(first_log['frequency'], self.bpe.get_stats(words)[first_pair])
+
+        # Once the one sampled word is fully merged, training goes on with a new sample
+        sampled = HindiBPE(vocab_size=100)
+        sampled.fit("कम कम कम जल जल", min_freq=1, sample_size=1, seed=0)
+        self.assertEqual(set(sampled.merges.values()), {'कम', 'जल'})
+        self.assertEqual(sampled.metrics.token_logs[-1]['tokens'], 5)
+
+        with self.assertRaises(ValueError):
+            HindiBPE(vocab_size=100).fit(self.test_text, sample_size=0)
+        with self.assertRaises(ValueError):
+            HindiBPE(vocab_size=100).fit(self.test_text, backend='numpy', sample_size=5)
+
+    def test_metrics_compare(self):
+        """Test quality report of approximate against exact training."""
+        self.bpe.fit(self.test_text)
+        sampled = HindiBPE(vocab_size=100)
+        sampled.fit(self.test_text, sample_size=1000, seed=0)
+        report = sampled.metrics.compare(self.bpe.metrics, top_k=10)
+        self.assertIn('compression_ratio', report)
+        self.assertIn('reference_compression_ratio', report)
+        self.assertGreaterEqual(report['top_merge_agreement'], 0.0)
+        self.assertLessEqual(report['top_merge_agreement'], 1.0)
+
+        # Comparing a run against itself is a perfect match
+        self_report = self.bpe.metrics.compare(self.bpe.metrics)
+        self.assertEqual(self_report['top_merge_agreement'], 1.0)
+        self.assertEqual(self_report['compression_ratio_delta'], 0.0)
+
+    def test_encode_matches_merge_vocab(self):
+        """Test cached per-word encoding matches applying every merge in order."""
+        self.bpe.fit(self.test_text)
+        words = [[c for c in word] for word in self.test_text.split()]
+        for pair, new_token in self.bpe.merges.items():
+            words = self.bpe.merge_vocab(words, pair, new_token)
+        expected = [token for word in words for token in word]
+        self.assertEqual(self.bpe.encode(self.test_text), expected)
+        # Second pass is served from the cache
+        self.assertEqual(self.bpe.encode(self.test_text), expected)
+        
+        ids = self.bpe.encode_ids(self.test_text + " xyz")
+        self.assertEqual([self.bpe.id_to_token[i] for i in ids[:-3]], expected)
+        self.assertEqual(ids[-3:], [self.bpe.unk_id] * 3)
+        
+        # The local cache is bounded
+        small = HindiBPE(vocab_size=100, cache_size=2)
+        small.merges = self.bpe.merges
+        small.vocab = self.bpe.vocab
+        self.assertEqual(small.encode(self.test_text), expected)
+        self.assertLessEqual(len(small.cache), 2)
+
+    def test_shared_cache(self):
+        """Test the shared-memory encode cache across worker processes."""
+        self.bpe.fit(self.test_text)
+        cache = SharedEncodeCache.create(capacity=4, probe_limit=2, model_key=self.bpe.model_key)
+        try:
+            self.assertIsNone(cache.get('नमस्ते'))
+            self.assertTrue(cache.put('नमस्ते', [1, 2, 3]))
+            self.assertEqual(cache.get('नमस्ते'), [1, 2, 3])
+            self.assertFalse(cache.put('लंबा', list(range(cache.max_span + 1))))
+            
+            # Size stays bounded: inserting many words evicts older ones
+            for i in range(20):
+                cache.put(f'शब्द{i}', [i])
+            self.assertLessEqual(len(cache), 4)
+            
+            with self.assertRaises(ValueError):
+                HindiBPE(vocab_size=100).attach_shared_cache(cache)
+            
+            # A slot whose hash and IDs come from different writers reads as a miss
+            cache.put('क', [5, 6])
+            slot = next(i for i, h in enumerate(cache.hashes) if h == word_hash('क'))
+            cache.ids[slot * cache.max_span] = 9
+            self.assertIsNone(cache.get('क'))
+            
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                model_path = os.path.join(tmp_dir, 'model.json')
+                self.bpe.save(model_path)
+                big = SharedEncodeCache.create(model_key=self.bpe.model_key)
+                try:
+                    worker = multiprocessing.Process(
+                        target=_encode_with_shared_cache,
+                        args=(model_path, big.shm.name, self.test_text)
+                    )
+                    worker.start()
+                    worker.join()
+                    self.assertEqual(worker.exitcode, 0)
+                    
+                    # Words encoded by the worker are now hits in this process
+                    expected = self.bpe.encode(self.test_text)
+                    self.bpe.cache = {}
+                    self.bpe.attach_shared_cache(big, local_cache_size=2)
+                    self.assertEqual(self.bpe.encode(self.test_text), expected)
+                    self.assertEqual(big.misses, 0)
+                    self.assertGreater(big.hits, 0)
+                    # Only a small local L1 is kept in front of the shared table
+                    self.assertLessEqual(len(self.bpe.cache), 2)
+                    
+                    # Loading a different model detaches the cache built for the old one
+                    other = HindiBPE(vocab_size=60)
+                    other.fit(self.test_text + " ॐ ॐ")
+                    other_path = os.path.join(tmp_dir, 'other.json')
+                    other.save(other_path)
+                    self.bpe.load(other_path)
+                    self.assertIsNone(self.bpe.shared_cache)
+                    self.assertEqual(self.bpe.encode(self.test_text), other.encode(self.test_text))
+                    
+                    # Reloading the same model keeps it attached
+                    self.bpe.load(model_path)
+                    self.bpe.attach_shared_cache(big)
+                    self.bpe.load(model_path)
+                    self.assertIs(self.bpe.shared_cache, big)
+                finally:
+                    big.close()
+                    big.unlink()
+        finally:
+            cache.close()
+            cache.unlink()
+
+    def test_shared_cache_concurrent_open(self):
+        """Test workers opening the shared cache together all attach successfully."""
+        for trial in range(3):
+            name = f"hbpe_test_{os.getpid()}_{trial}"
+            barrier = multiprocessing.Barrier(8)
+            results = multiprocessing.Queue()
+            workers = [
+                multiprocessing.Process(target=_open_shared_cache, args=(name, barrier, results))
+                for _ in range(8)
+            ]
+            for worker in workers:
+                worker.start()
+            outcomes = [results.get(timeout=30) for _ in workers]
+            for worker in workers:
+                worker.join()
+            cache = SharedEncodeCache.attach(name)
+            cache.close()
+            cache.unlink()
+            self.assertEqual([key for key, _ in outcomes], [7] * 8)
+            self.assertEqual(sum(created for _, created in outcomes), 1)
+
+    def test_shared_cache_untracked(self):
+        """Test an untracked cache outlives the process that created it."""
+        name = f"hbpe_keep_{os.getpid()}"
+        code = (
+            "from bpe.shared_cache import SharedEncodeCache\n"
+            f"SharedEncodeCache.create({name!r}, model_key=7, track=False).close()"
+        )
+        subprocess.run([sys.executable, '-c', code], check=True)
+        cache = SharedEncodeCache.attach(name, timeout=0)
+        self.assertEqual(cache.model_key, 7)
+        cache.close()
+        cache.unlink()
+
+    def test_count_and_truncate(self):
+        """Test token counting and truncation without full encoding."""
+        self.bpe.fit(self.test_text)
+        tokens = self.bpe.encode(self.test_text)
+        self.assertEqual(self.bpe.count_tokens(self.test_text), len(tokens))
+        self.assertEqual(self.bpe.count_tokens("   "), 0)
+        
+        for n in [0, 1, 3, len(tokens) - 1]:
+            truncated = self.bpe.truncate(self.test_text, n)
+            self.assertTrue(self.test_text.startswith(truncated))
+            self.assertEqual(''.join(truncated.split()), ''.join(tokens[:n]))
+        self.assertEqual(self.bpe.truncate(self.test_text, len(tokens)), self.test_text)
+        
+        with self.assertRaises(ValueError):
+            self.bpe.truncate(self.test_text, -1)
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_count_tokens_batch(self):
+        """Test batched token counts."""
+        self.bpe.fit(self.test_text)
+        texts = self.test_text.splitlines()
+        counts = self.bpe.count_tokens_batch(texts)
+        self.assertEqual(counts.dtype, numpy.int64)
+        self.assertEqual(counts.tolist(), [len(self.bpe.encode(t)) for t in texts])
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_metrics_export(self):
+        """Test columnar metrics and compact CSV/NPZ export."""
+        self.bpe.fit(self.test_text)
+        columns = self.bpe.metrics.columns
+        self.assertEqual(columns['new_token'], [log['new_token'] for log in self.bpe.metrics.token_logs])
+        
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'metrics')
+            self.bpe.metrics.export(path)
+            arrays = numpy.load(path + '.npz')
+            self.assertEqual(arrays['frequency'].tolist(), columns['frequency'])
+            self.assertEqual(arrays['compression_ratio'].tolist(), columns['compression_ratio'])
+            with open(path + '.csv', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+            self.assertEqual(len(lines), len(columns['iteration']) + 1)
+            self.assertTrue(lines[0].startswith('iteration,'))
+
+    def test_metrics_export_without_numpy(self):
+        """Test the CSV export still works when numpy is unavailable."""
+        self.bpe.fit(self.test_text)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, 'metrics')
+            saved = sys.modules.get('numpy')
+            sys.modules['numpy'] = None  # makes `import numpy` raise ImportError
+            try:
+                self.bpe.metrics.export(path)
+            finally:
+                if saved is None:
+                    del sys.modules['numpy']
+                else:
+                    sys.modules['numpy'] = saved
+            self.assertTrue(os.path.exists(path + '.csv'))
+            self.assertFalse(os.path.exists(path + '.npz'))
+
+    def test_metrics_log_views(self):
+        """Test token and compression logs are read-only snapshots of the columns."""
+        self.bpe.fit(self.test_text)
+        logs = self.bpe.metrics.token_logs
+        with self.assertRaises(AttributeError):
+            logs.append({})
+        
+        # Setting compression logs keeps their iterations
+        metrics = self.bpe.metrics
+        metrics.compression_logs = [{'iteration': 10, 'compression_ratio': 1.5}]
+        self.assertEqual(metrics.compression_logs, ({'iteration': 10, 'compression_ratio': 1.5},))
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_plot_training_stats(self):
+        """Smoke test rendering all training plots."""
+        try:
+            import matplotlib
+        except ImportError:
+            self.skipTest("matplotlib not installed")
+        matplotlib.use('Agg')
+        from bpe.visualization import BPEVisualizer
+        self.bpe.fit(self.test_text)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            visualizer = BPEVisualizer(tmp_dir, max_points=4)
+            visualizer.plot_training_stats(self.bpe.metrics)
+            for filename in ['training_stats.png', 'vocab_size.png',
+                             'compression_ratio.png', 'token_frequencies.png']:
+                self.assertGreater(os.path.getsize(os.path.join(tmp_dir, 'plots', filename)), 0)
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_minmax_downsample(self):
+        """Test decimation keeps the extremes of long series."""
+        from bpe.visualization import minmax_downsample
+        x = numpy.arange(100000)
+        y = numpy.sin(x / 500.0)
+        y[12345] = 10.0
+        xs, ys = minmax_downsample(x, y, max_points=1000)
+        self.assertLessEqual(len(xs), 1002)
+        self.assertEqual(ys.max(), 10.0)
+        self.assertEqual(ys.min(), y.min())
+        self.assertEqual((xs[0], xs[-1]), (0, 99999))
+
+    def test_encode_stream(self):
+        """Test chunked encoding handles words split across chunk boundaries."""
+        self.bpe.fit(self.test_text)
+        expected = self.bpe.encode_ids(self.test_text)
+        for chunk_size in [1, 3, 7, 1000]:
+            with io.StringIO(self.test_text) as f:
+                ids = [i for chunk in self.bpe.encode_stream(f, chunk_size) for i in chunk]
+            self.assertEqual(ids, expected)
+        
+        # Iterables of strings work too, e.g. file lines or stdin
+        lines = self.test_text.splitlines(keepends=True)
+        ids = [i for chunk in self.bpe.encode_stream(lines) for i in chunk]
+        self.assertEqual(ids, expected)
+        
+        # Long runs without whitespace span many chunks, including empty ones
+        text = "नमस्ते" * 50 + " भारत " + "हिंदी" * 30
+        pieces = [text[i:i + 4] for i in range(0, len(text), 4)] + ['']
+        ids = [i for chunk in self.bpe.encode_stream(pieces) for i in chunk]
+        self.assertEqual(ids, self.bpe.encode_ids(text))
+
+    def test_encode_shards_cli(self):
+        """Test the shard-writing command-line entry point."""
+        import encode_hindi_bpe
+        self.bpe.fit(self.test_text)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = os.path.join(tmp_dir, 'model.json')
+            input_path = os.path.join(tmp_dir, 'input.txt')
+            prefix = os.path.join(tmp_dir, 'shards', 'hindi')
+            self.bpe.save(model_path)
+            with open(input_path, 'w', encoding='utf-8') as f:
+                f.write(self.test_text)
+            
+            encode_hindi_bpe.main([input_path, '-o', prefix, '--model', model_path,
+                                   '--shard-size', '10', '--chunk-size', '16'])
+            
+            with open(prefix + '.index.json', encoding='utf-8') as f:
+                index = json.load(f)
+            self.assertEqual(index['dtype'], 'uint16')
+            ids = array('H')
+            for shard in index['shards']:
+                self.assertLessEqual(shard['tokens'], 10)
+                with open(os.path.join(tmp_dir, 'shards', shard['file']), 'rb') as f:
+                    ids.fromfile(f, shard['tokens'])
+            expected = self.bpe.encode_ids(self.test_text)
+            self.assertEqual(ids.tolist(), expected)
+            self.assertEqual(index['total_tokens'], len(expected))
+            self.assertEqual(index['documents'], [{'source': input_path, 'start': 0, 'end': len(expected)}])
+
+            # stdin is read as UTF-8 even when the locale says otherwise
+            stdin_prefix = os.path.join(tmp_dir, 'stdin', 'hindi')
+            subprocess.run(
+                [sys.executable, encode_hindi_bpe.__file__, '-o', stdin_prefix, '--model', model_path],
+                input=self.test_text.encode('utf-8'), check=True,
+                env=dict(os.environ, PYTHONIOENCODING='latin-1')
+            )
+            with open(stdin_prefix + '.index.json', encoding='utf-8') as f:
+                stdin_index = json.load(f)
+            with open(os.path.join(tmp_dir, 'stdin', stdin_index['shards'][0]['file']), 'rb') as f:
+                stdin_ids = array('H')
+                stdin_ids.fromfile(f, stdin_index['total_tokens'])
+            self.assertEqual(stdin_ids.tolist(), expected)
+
+    def test_slim_encoder(self):
+        """Test the inference-only encoder matches HindiBPE."""
+        from bpe import BPEEncoder
+        self.bpe.fit(self.test_text)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            model_path = os.path.join(tmp_dir, 'model.json')
+            self.bpe.save(model_path)
+            encoder = BPEEncoder.from_file(model_path)
+        self.assertEqual(encoder.encode(self.test_text), self.bpe.encode(self.test_text))
+        self.assertEqual(encoder.encode_ids(self.test_text), self.bpe.encode_ids(self.test_text))
+        self.assertEqual(encoder.model_key, self.bpe.model_key)
+        
+        # Same merges but a different base vocab means different token IDs
+        encoder.vocab = encoder.vocab | {'ॐ'}
+        self.assertNotEqual(encoder.model_key, self.bpe.model_key)
+
+    def test_inference_import_is_light(self):
+        """Test the inference path does not import training, metrics or plotting code."""
+        code = (
+            "import sys\n"
+            "import bpe\n"
+            "from bpe.encoder import BPEEncoder\n"
+            "heavy = ['typing', 'numpy', 'matplotlib', 'multiprocessing', 'bpe.metrics', 'bpe.hindi_bpe']\n"
+            "print(','.join(m for m in heavy if m in sys.modules))"
+        )
+        # -S skips site-packages .pth hooks, which may import typing themselves
+        result = subprocess.run([sys.executable, '-S', '-c', code], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__)))
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertEqual(result.stdout.strip(), '')
+
 if __name__ == '__main__':
     unittest.main(verbosity=2) 
\ No newline at end of file
@@ -37,6 +37,7 @@ def main():
     model_path = os.path.join(MODEL_DIR, 'model.json')
     stats_path = os.path.join(STATS_DIR, 'metrics.json')
     bpe.save(model_path, stats_path)
+    bpe.metrics.export(os.path.join(STATS_DIR, 'metrics'))
     
     # Generate and save visualization plots
     visualizer = BPEVisualizer(STATS_DIR)